@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import os
-import re
 import sys
 import yaml
 from pathlib import Path
@@ -18,10 +17,25 @@ REFERENCE_AGREEMENT = """Я подтверждаю следующее:
 аннулирование результатов.
 """
 
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 def normalize(s):
     return "\n".join(line.rstrip() for line in s.strip().splitlines())
 
 
+NORMALIZED_REFERENCE_AGREEMENT = normalize(REFERENCE_AGREEMENT)
+GRADING_VALUES = frozenset({'homeworks', 'project'})
+AGREE_VALUES = frozenset({'yes', True})
+REPO_NONE_VALUES = frozenset({'None', None})
+
+
+def is_one_of(value, choices):
+    try:
+        return value in choices
+    except TypeError:
+        return False
+
+
 def load_env_vars():
     return {
         'pr_title': os.environ.get('PR_TITLE', '').strip(),
@@ -32,31 +46,29 @@ def load_env_vars():
     }
 
 
-def print_header(pr_author):
-    print("=" * 70)
-    print("Валидация регистрации на курс FBB Orchestration 2025")
-    print(f"\tАвтор PR (эталонный username): {pr_author}")
-    print("=" * 70)
-    print()
+def report_header(pr_author, report):
+    report.append("=" * 70)
+    report.append("Валидация регистрации на курс FBB Orchestration 2025")
+    report.append(f"\tАвтор PR (эталонный username): {pr_author}")
+    report.append("=" * 70)
+    report.append("")
 
 
-def validate_branch_name(pr_author, pr_branch):
+def validate_branch_name(expected, pr_branch, report):
     errors = []
-    expected = f"{pr_author}_accept"
-    if not re.fullmatch(rf"{re.escape(pr_author)}_accept", pr_branch):
+    if pr_branch != expected:
         errors.append(
             f"!!  Неверное имя ветки.\n"
             f"    Ожидается: '{expected}'\n"
             f"    Получено:  '{pr_branch}'\n"
         )
     else:
-        print(f"....Ветка имеет корректное имя: {pr_branch}")
+        report.append(f"....Ветка имеет корректное имя: {pr_branch}")
     return errors
 
 
-def validate_pr_title(pr_author, pr_title):
+def validate_pr_title(expected, pr_title, report):
     errors = []
-    expected = f"acceptance-orch2025-{pr_author}"
     if pr_title != expected:
         errors.append(
             f"!!  Неверный заголовок pull request.\n"
@@ -64,11 +76,11 @@ def validate_pr_title(pr_author, pr_title):
             f"    Получено:  '{pr_title}'\n"
         )
     else:
-        print(f"....Заголовок PR корректный: {pr_title}")
+        report.append(f"....Заголовок PR корректный: {pr_title}")
     return errors
 
 
-def validate_file_exists(pr_author):
+def validate_file_exists(pr_author, report):
     errors = []
     yaml_path = Path('accepts_2025') / f'{pr_author}.yaml'
     if not yaml_path.exists():
@@ -79,121 +91,175 @@ def validate_file_exists(pr_author):
         )
         return errors, None
     else:
-        print(f"....Файл найден: {yaml_path}")
+        report.append(f"....Файл найден: {yaml_path}")
         return errors, yaml_path
 
 
-def validate_yaml_content(pr_author, yaml_path):
+def check_github_username(value, pr_author, report):
+    errors = []
+    if not isinstance(value, str) or not value.strip():
+        errors.append("!!  Поле 'github_username' должно быть непустой строкой")
+    elif value != pr_author:
+        errors.append(
+            f"!!  Несоответствие github_username.\n"
+            f"    Указано: '{value}'\n"
+            f"    Ожидается: '{pr_author}' (ваш GitHub username)"
+        )
+    else:
+        report.append(f"....github_username совпадает с логином автора PR: {pr_author}")
+    return errors
+
+
+def check_first_name(value, pr_author, report):
+    errors = []
+    if not isinstance(value, str) or not value.strip():
+        errors.append("!!  Поле 'first_name' должно быть непустой строкой с именем")
+    else:
+        report.append(f"....Имя указано: {value}")
+    return errors
+
+
+def check_last_name(value, pr_author, report):
+    errors = []
+    if not isinstance(value, str) or not value.strip():
+        errors.append("!!  Поле 'last_name' должно быть непустой строкой с фамилией")
+    else:
+        report.append(f"....Фамилия указана: {value}")
+    return errors
+
+
+def check_repo(value, pr_author, report):
+    errors = []
+    if is_one_of(value, REPO_NONE_VALUES):
+        report.append(f"....Выбран формат сдачи: проект (repo=None)")
+    elif isinstance(value, str) and value.strip().startswith(('http://', 'https://')):
+        report.append(f"....Указан репозиторий для домашних заданий: {value.strip()}")
+    else:
+        errors.append(
+            f"!!  Поле 'repo' должно быть строкой 'None' или валидным URL (начинающимся с http:// или https://).\n"
+            f"    Получено: '{value}' (тип: {type(value).__name__})"
+        )
+    return errors
+
+
+def check_grading(value, pr_author, report):
+    errors = []
+    if not is_one_of(value, GRADING_VALUES):
+        errors.append(
+            f"!!  Поле 'grading' должно быть 'homeworks' или 'project'.\n"
+            f"    Получено: '{value}'"
+        )
+    else:
+        report.append(f"....Формат сдачи: {value}")
+    return errors
+
+
+def check_agreement(value, pr_author, report):
+    errors = []
+    if not isinstance(value, str) or not value.strip():
+        errors.append("!!  Поле 'agreement' должно содержать текст соглашения")
+    elif normalize(value) != NORMALIZED_REFERENCE_AGREEMENT:
+        errors.append(
+            "!!  Текст соглашения не совпадает с официальным текстом курса.\n"
+            "    Скопируйте текст соглашения дословно из файла README.md в папке accepts_2025/"
+        )
+    else:
+        report.append("....Текст соглашения совпадает с официальным текстом курса")
+    return errors
+
+
+def check_agree_to_rules(value, pr_author, report):
+    errors = []
+    if not is_one_of(value, AGREE_VALUES):
+        errors.append(
+            f"!!  Поле 'agree_to_rules' должно содержать значение 'yes'.\n"
+            f"    Получено: '{value}'"
+        )
+    else:
+        report.append("....Согласие с правилами подтверждено (agree_to_rules: yes)")
+    return errors
+
+
+def check_grading_repo(grading, repo):
+    errors = []
+    if grading == 'project' and not is_one_of(repo, REPO_NONE_VALUES):
+        errors.append(
+            "!!  При grading: project поле repo должно быть 'None'."
+        )
+    if grading == 'homeworks':
+        if not (isinstance(repo, str) and repo.startswith(('http://', 'https://'))):
+            errors.append(
+                "!!  При grading: homeworks поле repo должно содержать URL репозитория."
+            )
+    return errors
+
+
+FIELD_VALIDATORS = {
+    'github_username': check_github_username,
+    'first_name': check_first_name,
+    'last_name': check_last_name,
+    'repo': check_repo,
+    'grading': check_grading,
+    'agreement': check_agreement,
+    'agree_to_rules': check_agree_to_rules,
+}
+REQUIRED_FIELDS = frozenset(FIELD_VALIDATORS)
+
+
+def validate_yaml_content(pr_author, yaml_path, report):
     errors = []
+    raw = yaml_path.read_bytes()
+    if pr_author.encode('utf-8') not in raw:
+        errors.append(
+            f"!!  Несоответствие github_username.\n"
+            f"    В файле не найден ваш GitHub username: '{pr_author}'"
+        )
+        return errors
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        if data is None:
-            errors.append(f"!!  Файл '{yaml_path}' пустой или содержит только комментарии")
-            return errors
-        required_fields = ['github_username', 'first_name', 'last_name', 'repo', 'grading', 'agreement', 'agree_to_rules']
-        for field in required_fields:
-            if field not in data:
-                errors.append(f"!!  В файле отсутствует обязательное поле: '{field}'")
-        if 'github_username' in data:
-            if not isinstance(data['github_username'], str) or not data['github_username'].strip():
-                errors.append("!!  Поле 'github_username' должно быть непустой строкой")
-            elif data['github_username'] != pr_author:
-                errors.append(
-                    f"!!  Несоответствие github_username.\n"
-                    f"    Указано: '{data['github_username']}'\n"
-                    f"    Ожидается: '{pr_author}' (ваш GitHub username)"
-                )
-            else:
-                print(f"....github_username совпадает с логином автора PR: {pr_author}")
-        if 'first_name' in data:
-            if not isinstance(data['first_name'], str) or not data['first_name'].strip():
-                errors.append("!!  Поле 'first_name' должно быть непустой строкой с именем")
-            else:
-                print(f"....Имя указано: {data['first_name']}")
-        if 'last_name' in data:
-            if not isinstance(data['last_name'], str) or not data['last_name'].strip():
-                errors.append("!!  Поле 'last_name' должно быть непустой строкой с фамилией")
-            else:
-                print(f"....Фамилия указана: {data['last_name']}")
-        if 'repo' in data:
-            repo_val = data['repo']
-            if repo_val in ('None', None):
-                print(f"....Выбран формат сдачи: проект (repo=None)")
-            elif isinstance(repo_val, str) and repo_val.strip().startswith(('http://', 'https://')):
-                print(f"....Указан репозиторий для домашних заданий: {repo_val.strip()}")
-            else:
-                errors.append(
-                    f"!!  Поле 'repo' должно быть строкой 'None' или валидным URL (начинающимся с http:// или https://).\n"
-                    f"    Получено: '{repo_val}' (тип: {type(repo_val).__name__})"
-                )
-        if 'grading' in data:
-            if data['grading'] not in ['homeworks', 'project']:
-                errors.append(
-                    f"!!  Поле 'grading' должно быть 'homeworks' или 'project'.\n"
-                    f"    Получено: '{data['grading']}'"
-                )
-            else:
-                print(f"....Формат сдачи: {data['grading']}")
-
-        if 'grading' in data and 'repo' in data:
-            grading = data['grading']
-            repo = data['repo']
-
-            if grading == 'project' and repo not in ('None', None):
-                errors.append(
-                    "!!  При grading: project поле repo должно быть 'None'."
-                )
-
-            if grading == 'homeworks':
-                if not (isinstance(repo, str) and repo.startswith(('http://', 'https://'))):
-                    errors.append(
-                        "!!  При grading: homeworks поле repo должно содержать URL репозитория."
-                    )
-
-        if 'agreement' in data:
-            if not isinstance(data['agreement'], str) or not data['agreement'].strip():
-                errors.append("!!  Поле 'agreement' должно содержать текст соглашения")
-            else:
-                if normalize(data['agreement']) != normalize(REFERENCE_AGREEMENT):
-                    errors.append(
-                        "!!  Текст соглашения не совпадает с официальным текстом курса.\n"
-                        "    Скопируйте текст соглашения дословно из файла README.md в папке accepts_2025/"
-                    )
-                else:
-                    print("....Текст соглашения совпадает с официальным текстом курса")
-        if 'agree_to_rules' in data:
-            if data['agree_to_rules'] not in ('yes', True):
-                errors.append(
-                    f"!!  Поле 'agree_to_rules' должно содержать значение 'yes'.\n"
-                    f"    Получено: '{data['agree_to_rules']}'"
-                )
-            else:
-                print("....Согласие с правилами подтверждено (agree_to_rules: yes)")
-    except:
-        print("!!  Ошибка с YAML-файлом.")
+        data = yaml.load(raw, Loader=YAML_LOADER)
+    except yaml.YAMLError as e:
+        errors.append(f"!!  Ошибка разбора YAML-файла '{yaml_path}':\n    {e}")
+        return errors
+    if data is None:
+        errors.append(f"!!  Файл '{yaml_path}' пустой или содержит только комментарии")
+        return errors
+    if not isinstance(data, dict):
+        errors.append(
+            f"!!  Файл '{yaml_path}' должен содержать набор полей вида 'ключ: значение'.\n"
+            f"    Получено: {type(data).__name__}"
+        )
+        return errors
+    missing = REQUIRED_FIELDS.difference(data)
+    for field in FIELD_VALIDATORS:
+        if field in missing:
+            errors.append(f"!!  В файле отсутствует обязательное поле: '{field}'")
+    for field, check in FIELD_VALIDATORS.items():
+        if field not in missing:
+            errors.extend(check(data[field], pr_author, report))
+    if 'grading' not in missing and 'repo' not in missing:
+        errors.extend(check_grading_repo(data['grading'], data['repo']))
     return errors
 
 
-def validate_changed_files(pr_author, base_sha, head_sha):
+def validate_changed_files(pr_author, base_sha, head_sha, report):
     errors = []
     try:
         result = subprocess.run(
-            ['git', 'diff', '--name-status', base_sha, head_sha],
+            ['git', 'diff', '--name-status', '-z', '--no-renames', base_sha, head_sha],
             capture_output=True,
-            text=True,
             check=True,
         )
-        changes = [line.split() for line in result.stdout.splitlines()]
+        fields = result.stdout.split(b'\0')[:-1]
+        n_changes = len(fields) // 2
 
-        if len(changes) != 1:
+        if n_changes != 1:
             errors.append(
                 f"!!  PR должен содержать ровно один изменённый файл.\n"
-                f"    Обнаружено изменений: {len(changes)}"
+                f"    Обнаружено изменений: {n_changes}"
             )
             return errors
 
-        status, path = changes[0]
+        status, path = (field.decode('utf-8') for field in fields)
         expected = f'accepts_2025/{pr_author}.yaml'
 
         if status != 'A':
@@ -209,7 +275,7 @@ def validate_changed_files(pr_author, base_sha, head_sha):
                 f"    Получено:  {path}"
             )
         else:
-            print(f"....Добавлен корректный файл: {path}")
+            report.append(f"....Добавлен корректный файл: {path}")
         return errors
     except subprocess.CalledProcessError as e:
         errors.append(f"!!  Ошибка git diff: {e}")
@@ -217,40 +283,46 @@ def validate_changed_files(pr_author, base_sha, head_sha):
 
 
 
-def print_results(errors):
-    print("=" * 70)
+def report_results(errors, report):
+    report.append("=" * 70)
     if errors:
-        print("ОБНАРУЖЕНЫ ОШИБКИ (требуют исправления):")
-        print()
+        report.append("ОБНАРУЖЕНЫ ОШИБКИ (требуют исправления):")
+        report.append("")
         for err in errors:
-            print(err)
-            print()
+            report.append(err)
+            report.append("")
     else:
-        print("ВСЕ ПРОВЕРКИ ПРОЙДЕНЫ УСПЕШНО!")
-        print()
-    print("=" * 70)
+        report.append("ВСЕ ПРОВЕРКИ ПРОЙДЕНЫ УСПЕШНО!")
+        report.append("")
+    report.append("=" * 70)
 
 
 def main():
     env = load_env_vars()
-    print_header(env['pr_author'])
+    expected_branch = f"{env['pr_author']}_accept"
+    expected_title = f"acceptance-orch2025-{env['pr_author']}"
+    report = []
     all_errors = []
-    all_errors.extend(validate_branch_name(env['pr_author'], env['pr_branch']))
-    print()
-    all_errors.extend(validate_pr_title(env['pr_author'], env['pr_title']))
-    print()
-    file_errors, yaml_path = validate_file_exists(env['pr_author'])
-    all_errors.extend(file_errors)
-    print()
-    if yaml_path:
-        content_errors = validate_yaml_content(env['pr_author'], yaml_path)
-        all_errors.extend(content_errors)
-        print()
-    changed_errors = validate_changed_files(
-        env['pr_author'], env['base_sha'], env['head_sha']
-    )
-    all_errors.extend(changed_errors)
-    print_results(all_errors)
+    try:
+        report_header(env['pr_author'], report)
+        all_errors.extend(validate_branch_name(expected_branch, env['pr_branch'], report))
+        report.append("")
+        all_errors.extend(validate_pr_title(expected_title, env['pr_title'], report))
+        report.append("")
+        file_errors, yaml_path = validate_file_exists(env['pr_author'], report)
+        all_errors.extend(file_errors)
+        report.append("")
+        if yaml_path:
+            content_errors = validate_yaml_content(env['pr_author'], yaml_path, report)
+            all_errors.extend(content_errors)
+            report.append("")
+        changed_errors = validate_changed_files(
+            env['pr_author'], env['base_sha'], env['head_sha'], report
+        )
+        all_errors.extend(changed_errors)
+        report_results(all_errors, report)
+    finally:
+        sys.stdout.write("\n".join(report) + "\n")
     sys.exit(0 if not all_errors else 1)
 
 